@@ -80,13 +80,16 @@ logging.getLogger("envclasses").setLevel(logging.DEBUG)
 """
 import enum
 import functools
+import json
 import logging
 import os
-from dataclasses import Field, fields
-from typing import Any, Dict, List, Optional, Type, TypeVar, Union, cast
+import re
+from dataclasses import MISSING, Field, fields
+from typing import (Any, Callable, Dict, Hashable, List, Mapping, NamedTuple, Optional, Tuple, Type,
+                    TypeVar, Union, cast)
 
 import yaml
-from typing_inspect import get_args, get_origin, is_optional_type
+from typing_inspect import get_args, is_optional_type
 
 __all__ = [
     'envclass',
@@ -104,13 +107,38 @@ logger = logging.getLogger('envclasses')
 ENVCLASS_DUNDER_FUNC_NAME = '__envclasses_load_env__'
 """ Name of the generated dunder function to be called by `load_env`. """
 
+ENVCLASS_FIELDS_NAME = '__envclass_fields__'
+""" Name of the class attribute holding the dataclass fields of envclass. """
+
+ENVCLASS_NUM_LOOKUPS_NAME = '__envclass_num_lookups__'
+""" Name of the class attribute holding the number of env lookups by `load_env`. """
+
+ENVCLASS_PLAN_NAME = '__envclass_plan__'
+""" Name of the class attribute holding the per-field load plan. """
+
 ENVCLASS_PREFIX = 'env'
 """ Default prefix used for environment variables. """
 
+ENVCLASS_LAST_PREFIX_NAME = '__envclass_last_prefix__'
+""" Name of the class attribute caching the last given and normalized prefix. """
+
 T = TypeVar('T')
 
 JsonValue = TypeVar('JsonValue', str, int, float, bool, Dict, List)
 
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+"""
+YAML loader, libyaml-backed `CSafeLoader` if available. It rejects a few inputs the pure
+Python `SafeLoader` accepts, e.g. flow mappings without a space after `:` such as
+`{-1:[1]}`, and escaped surrogate pairs such as `"\\ud83d\\ude00"` in values `json` can't
+parse as a whole.
+"""
+
+_yaml_load = functools.partial(yaml.load, Loader=_YAML_LOADER)
+""" `yaml.load` with the loader bound once. """
+
+logger.debug('YAML loader: %s', _YAML_LOADER.__name__)
+
 
 class EnvclassError(TypeError):
     """
@@ -141,6 +169,36 @@ def _coalesce(typ: Type) -> Type:
             Union[tuple(tt for tt in get_args(typ, evaluate=True) if not is_optional_type(tt))])
 
 
+class _Category(enum.IntEnum):
+    """
+    Field type categories, indices of `_LOADERS` except for nested envclass.
+    """
+    LIST = 0
+    TUPLE = 1
+    DICT = 2
+    ENUM = 3
+    STR = 4
+    PRIMITIVE = 5
+    OTHER = 6
+    DATACLASS = 7
+
+
+class _FieldPlan(NamedTuple):
+    """
+    Load plan entry for a field, resolved once at decoration time.
+    """
+    name: str
+    """ Field name. """
+    upper_name: str
+    """ Upper-cased field name, the environment variable name without prefix. """
+    category: _Category
+    """ Category of the field type. """
+    type: Type
+    """ Field type with `Optional` removed. """
+    args: Any
+    """ Type arguments, or the value to member map for enum. """
+
+
 def envclass(_cls: Type[T]) -> Type[T]:
     """
     `envclass` decorator generates methods to loads field values from environment variables.
@@ -149,150 +207,454 @@ def envclass(_cls: Type[T]) -> Type[T]:
 
     @functools.wraps(_cls)
     def wrap(cls):
+        # Field types don't change after decoration, so resolve the loader
+        # for each field once here instead of on every `load_env` call.
+        cls_fields = tuple(fields(cls))
+        plan = tuple(_plan_field(f) for f in cls_fields)
 
-        def load_env(self, _prefix: str = None) -> None:
-            """
-            Load attributes from environment variables.
-            """
-            for f in fields(cls):
-                # If no prefix specified, use the default PREFIX.
-                prefix = _prefix if _prefix is not None else ENVCLASS_PREFIX
-                prefix += '_' if prefix and not prefix.endswith('_') else ''
-                logger.debug(f'prefix={prefix}, type={f.type}')
-
-                f_type = _coalesce(f.type)
-                if is_envclass(f_type):
-                    _load_dataclass(self, f, prefix, f_type)
-                elif is_list(f_type):
-                    _load_list(self, f, prefix, f_type)
-                elif is_tuple(f_type):
-                    _load_tuple(self, f, prefix, f_type)
-                elif is_dict(f_type):
-                    _load_dict(self, f, prefix, f_type)
-                elif is_enum(f_type):
-                    _load_enum(self, f, prefix, f_type)
-                elif is_str(f_type):
-                    _load_str(self, f, prefix, f_type)
-                else:
-                    _load_other(self, f, prefix, f_type)
+        load_env = _make_load_env(cls, plan)
 
+        setattr(cls, ENVCLASS_FIELDS_NAME, cls_fields)
+        setattr(cls, ENVCLASS_PLAN_NAME, plan)
+        setattr(cls, ENVCLASS_NUM_LOOKUPS_NAME, _count_lookups(plan))
         setattr(cls, ENVCLASS_DUNDER_FUNC_NAME, load_env)
         return cls
 
     return wrap(_cls)
 
 
-def _load_dataclass(obj, f: Field, prefix: str, f_type: Optional[Type] = None) -> None:
+def _count_lookups(plan: Tuple[_FieldPlan, ...]) -> int:
+    """
+    Count environment variable lookups done by `load_env` including nested envclasses.
+    """
+    return sum(
+        getattr(p.type, ENVCLASS_NUM_LOOKUPS_NAME, 0) if p.category == _Category.DATACLASS else 1
+        for p in plan)
+
+
+def _normalize_prefix(prefix: Optional[str]) -> str:
+    """
+    Get the upper-cased prefix of environment variables with the separator appended.
+    """
+    # If no prefix specified, use the default PREFIX.
+    prefix = prefix if prefix is not None else ENVCLASS_PREFIX
+    prefix += '_' if prefix and not prefix.endswith('_') else ''
+    return prefix.upper()
+
+
+def _make_load_env(cls: Type, plan: Tuple[_FieldPlan, ...]) -> Callable[..., None]:
+    """
+    Generate `load_env` specialized to the fields of the class.
+
+    Like `dataclasses` does for `__init__`, the function body is generated as a source
+    string with one loader call per field and compiled by `exec`, so no type dispatch
+    is left at runtime.
+    """
+    lines = [
+        f'def {ENVCLASS_DUNDER_FUNC_NAME}(self, _prefix=None, _env=None):',
+        '    """',
+        '    Load attributes from environment variables.',
+        '    """',
+    ]
+    # Variable names, and prefixes of nested envclasses, are cached along with the
+    # prefix. A nested envclass then also receives the same prefix object every time
+    # and hits its own cache. Prefixes of nested envclasses are normalized the same way
+    # as the prefix, e.g. field `in_` gives `IN_`.
+    names = [f'name_{i}' for i in range(len(plan))]
+    suffixes = [_normalize_prefix(p.upper_name) if p.category == _Category.DATACLASS
+                else p.upper_name for p in plan]
+    cached = ''.join(f', {name}' for name in names)
+    lines.extend([
+        # Reuse the prefix normalized in the last call if the same prefix object
+        # is given, which is the case when reloading with a literal prefix. The
+        # default prefix is read on every call since it can be changed.
+        '    if _prefix is None:',
+        "        _prefix = _module_globals['ENVCLASS_PREFIX']",
+        f'    last_prefix, prefix{cached} = cls.{ENVCLASS_LAST_PREFIX_NAME}',
+        '    if _prefix is not last_prefix:',
+        '        prefix = _normalize_prefix(_prefix)',
+    ])
+    lines.extend(f'        {name} = prefix + {suffix!r}' for name, suffix in zip(names, suffixes))
+    lines.append(f'        cls.{ENVCLASS_LAST_PREFIX_NAME} = (_prefix, prefix{cached})')
+    lines.append('    environ = _env if _env is not None else os.environ')
+    body_start = len(lines)
+    direct = False
+    setattr(cls, ENVCLASS_LAST_PREFIX_NAME, (MISSING, '') + ('', ) * len(plan))
+
+    ns: Dict[str, Any] = {
+        '_module_globals': globals(),
+        '_normalize_prefix': _normalize_prefix,
+        'logger': logger,
+        'DEBUG': logging.DEBUG,
+        'MISSING': MISSING,
+        'cls': cls,
+        'os': os,
+    }
+    if plan:
+        lines.append('    if logger.isEnabledFor(DEBUG):')
+        lines.extend(f"        logger.debug('prefix=%s, type=%s', prefix, _type_{i})"
+                     for i in range(len(plan)))
+    for i, (name, upper_name, category, typ, args) in enumerate(plan):
+        ns[f'_type_{i}'] = typ
+        ns[f'_args_{i}'] = args
+        if category == _Category.DATACLASS:
+            # Override the existing nested envclass object, or create one if it's not set.
+            lines.append(f'    o = getattr(self, {name!r}, None)')
+            lines.append('    if o is None:')
+            lines.append(f'        o = self.{name} = _type_{i}()')
+            # Skip the nested envclass if no variable has its prefix. Scanning the
+            # variables only pays off if it does more lookups than there are variables,
+            # which is usually the case with the snapshot made by `load_env`. Envclasses
+            # with envclass fields are always loaded, as that creates unset ones.
+            num_lookups = getattr(typ, ENVCLASS_NUM_LOOKUPS_NAME, 0)
+            nested_plan = getattr(typ, ENVCLASS_PLAN_NAME, ())
+            if any(p.category == _Category.DATACLASS for p in nested_plan):
+                lines.append(f'    o.{ENVCLASS_DUNDER_FUNC_NAME}(name_{i}, environ)')
+            else:
+                lines.append(f'    if {num_lookups} <= len(environ) or '
+                             f'any(k.startswith(name_{i}) for k in environ):')
+                lines.append(f'        o.{ENVCLASS_DUNDER_FUNC_NAME}(name_{i}, environ)')
+        else:
+            loader = _LOADERS[category]
+            ns[loader.__name__] = loader
+            lines.append(f'    s = environ.get(name_{i})')
+            lines.append('    if s is not None:')
+            value = f'{loader.__name__}(s, _type_{i}, _args_{i})'
+            indent = '        '
+            if category == _Category.STR and typ is str:
+                # Environment variables are already str, no conversion is needed.
+                value = 's'
+            elif category == _Category.ENUM:
+                lines.append(f'        v = {value}')
+                lines.append('        if v is not MISSING:')
+                value = 'v'
+                indent += '    '
+            # Store in the instance `__dict__` if that is all `setattr` would do,
+            # otherwise with a plain attribute assignment, which e.g. goes through
+            # the slot descriptor for `__slots__` classes.
+            if _stores_in_dict(cls, name):
+                direct = True
+                lines.append(f'{indent}if d is not None:')
+                lines.append(f'{indent}    d[{name!r}] = {value}')
+                lines.append(f'{indent}else:')
+                lines.append(f'{indent}    self.{name} = {value}')
+            else:
+                lines.append(f'{indent}self.{name} = {value}')
+    if direct:
+        # A subclass may define `__setattr__` or descriptors for the fields.
+        lines.insert(body_start, '    d = self.__dict__ if type(self) is cls else None')
+
+    exec('\n'.join(lines), ns)
+    load_env = ns[ENVCLASS_DUNDER_FUNC_NAME]
+    load_env.__qualname__ = f'{cls.__qualname__}.{load_env.__name__}'
+    return load_env
+
+
+def _stores_in_dict(cls: Type, name: str) -> bool:
+    """
+    Check if setting the attribute only stores the value in the instance `__dict__`,
+    i.e. the class has neither a custom `__setattr__` nor a data descriptor such as
+    a slot or a property for the attribute.
+    """
+    if cls.__setattr__ is not object.__setattr__:
+        return False
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return not hasattr(type(klass.__dict__[name]), '__set__')
+    return True
+
+
+def _plan_field(f: Field) -> _FieldPlan:
     """
-    Override exisiting dataclass object by environment variables.
+    Build the load plan entry for a field.
     """
-    inner_prefix = f'{prefix}{f.name}'
-    typ = f_type or f.type
-    if getattr(obj, f.name, None) is None:
-        setattr(obj, f.name, typ())
-    o = getattr(obj, f.name)
-    try:
-        o.__envclasses_load_env__(inner_prefix)
-    except KeyError:
-        pass
+    typ = _coalesce(f.type)
+    category = _classify(typ)
+    args: Any
+    if category == _Category.ENUM:
+        args = _enum_lookup(typ)
+    else:
+        args = getattr(typ, '__args__', None)
+    return _FieldPlan(f.name, f.name.upper(), category, typ, args)
 
 
-def _load_list(obj, f: Field, prefix: str, f_type: Optional[Type] = None) -> None:
+def _classify(typ: Type) -> _Category:
     """
-    Override list values by environment variables.
+    Get the category of the type.
     """
-    typ = f_type or f.type
-    element_type = typ.__args__[0]
-    name = f'{prefix.upper()}{f.name.upper()}'
+    # Not memoized because a class becomes envclass only once it's decorated.
+    if is_envclass(typ):
+        return _Category.DATACLASS
     try:
-        s: str = os.environ[name].strip()
-    except KeyError:
-        return
+        return _classify_type(cast(Hashable, typ))
+    except TypeError:
+        # Unhashable type e.g. `Annotated` with unhashable metadata.
+        return _classify_type.__wrapped__(typ)
+
+
+@functools.lru_cache(maxsize=None)
+def _classify_type(typ: Type) -> _Category:
+    """
+    Get the category of the non-envclass type. The predicates are pure
+    functions of the type, so the result is cached per type.
+    """
+    if is_list(typ):
+        return _Category.LIST
+    elif is_tuple(typ):
+        return _Category.TUPLE
+    elif is_dict(typ):
+        return _Category.DICT
+    elif is_enum(typ):
+        return _Category.ENUM
+    elif is_str(typ):
+        return _Category.STR
+    elif typ in (int, float, bool):
+        return _Category.PRIMITIVE
+    else:
+        return _Category.OTHER
 
-    yml = yaml.safe_load(s)
-    lst = [element_type(e) for e in yml]
-    setattr(obj, f.name, lst)
 
+def _load_list(s: str, typ: Type, args: Tuple) -> Any:
+    """
+    Load list value from the environment variable string.
+    """
+    element_type = args[0]
 
-def _load_tuple(obj, f: Field, prefix: str, f_type: Optional[Type] = None) -> None:
+    if element_type is str:
+        try:
+            return [_parse_scalar(e, element_type) for e in _split_flow(s, '[]', element_type)]
+        except ValueError:
+            pass
+    # Numbers are parsed by `json` and converted by `map` in bulk, both in C.
+    return list(map(element_type, _parse_value(s)))
+
+
+def _load_tuple(s: str, typ: Type, args: Tuple) -> Any:
     """
-    Override tuple values by environment variables.
+    Load tuple value from the environment variable string.
     """
-    typ = f_type or f.type
-    name = f'{prefix.upper()}{f.name.upper()}'
-    element_types = typ.__args__
-    try:
-        s: str = os.environ[name].strip()
-    except KeyError:
-        return
+    element_types = args
 
-    lst = yaml.safe_load(s)
+    lst = _parse_value(s)
     if len(lst) != len(element_types):
         raise InvalidNumberOfElement(f'expected={len(element_types)} '
                                      f'actual={len(lst)}')
-    tpl = tuple(element_type(e) for e, element_type in zip(lst, element_types))
-    setattr(obj, f.name, tpl)
+    return tuple(element_type(e) for e, element_type in zip(lst, element_types))
 
 
-def _load_dict(obj, f: Field, prefix: str, f_type: Optional[Type] = None) -> None:
+def _load_dict(s: str, typ: Type, args: Tuple) -> Any:
     """
-    Override dict values by environment variables.
+    Load dict value from the environment variable string.
     """
-    typ = f_type or f.type
-    name = f'{prefix.upper()}{f.name.upper()}'
-    key_type = typ.__args__[0]
-    value_type = typ.__args__[1]
+    key_type, value_type = args
+
     try:
-        s = os.environ[name].strip()
-    except KeyError:
-        return
+        dct = {}
+        for item in _split_flow(s, '{}', key_type, value_type):
+            k, sep, v = item.partition(': ')
+            if not sep:
+                raise ValueError(item)
+            dct[_parse_scalar(k.rstrip(), key_type)] = _parse_scalar(v.lstrip(), value_type)
+    except ValueError:
+        yml = _parse_value(s)
+        # Keys are hashable scalars, never lists or dicts, so they are converted by
+        # the type itself.
+        value_conv = _converter(value_type)
+        dct = {key_type(k): value_conv(v) for k, v in yml.items()}
+    return dct
+
 
-    dct = {_to_value(k, key_type): _to_value(v, value_type) for k, v in yaml.safe_load(s).items()}
-    setattr(obj, f.name, dct)
+_LIST_DICT = (list, dict)
+""" Types of parsed collections, kept as they are by `_to_value`. """
 
 
 def _to_value(v: JsonValue, typ: Type) -> Any:
-    if isinstance(v, (List, Dict)):
+    if isinstance(v, _LIST_DICT):
         return v
     else:
         return typ(v)
 
 
-def _load_enum(obj, f: Field, prefix: str, f_type: Optional[Type] = None) -> None:
-    name = f'{prefix.upper()}{f.name.upper()}'
-    typ = f_type or f.type
-    for enum_item in list(typ):
+def _converter(typ: Type) -> Callable[[Any], Any]:
+    """
+    Get the function to convert a parsed value into `typ` like `_to_value`, bound
+    ahead of converting many values.
+    """
+    def convert(v: Any) -> Any:
+        return v if isinstance(v, _LIST_DICT) else typ(v)
+
+    return convert
+
+
+def _parse_value(s: str) -> Any:
+    """
+    Parse the string as YAML. JSON compatible strings such as `[1, 2]` are parsed
+    by `json` which is much faster than YAML even with libyaml.
+    """
+    try:
+        if 'e' in s or 'E' in s or 'N' in s or 'I' in s:
+            return json.loads(s, parse_float=_parse_json_float,
+                              parse_constant=_reject_json_constant)
+        # No exponent, `NaN` or `Infinity` to reject, parse without Python callbacks.
+        return json.loads(s)
+    except ValueError:
+        # `json` skips surrounding whitespace by itself, YAML rejects e.g. a leading tab.
+        return _yaml_load(s.strip())
+
+
+def _parse_json_float(s: str) -> float:
+    # YAML reads e.g. `1e5` as a string.
+    if 'e' in s or 'E' in s:
+        raise ValueError(s)
+    return float(s)
+
+
+def _reject_json_constant(s: str) -> Any:
+    # `NaN` and `Infinity` are strings in YAML.
+    raise ValueError(s)
+
+
+_SCALAR_TYPES = (int, float, str)
+""" Element types `_split_flow` and `_parse_scalar` can handle without YAML. """
+
+_YAML_SPECIAL_CHARS = re.compile(r'[][{}"\'#&*!|>%@`]')
+
+_YAML_RESERVED_WORDS = frozenset((
+    'yes', 'Yes', 'YES', 'no', 'No', 'NO', 'true', 'True', 'TRUE', 'false', 'False', 'FALSE',
+    'on', 'On', 'ON', 'off', 'Off', 'OFF', 'null', 'Null', 'NULL'))
+
+
+def _split_flow(s: str, brackets: str, *types: Type) -> List[str]:
+    """
+    Split a flat YAML flow collection such as `[1, 2]` into stripped items
+    without running the YAML parser.
+
+    Raise `ValueError` if the string is not a flat collection of plain scalars
+    of `types`, in which case it has to be parsed by YAML.
+    """
+    if not all(t in _SCALAR_TYPES for t in types):
+        raise ValueError(s)
+    if s[:1] != brackets[0] or s[-1:] != brackets[1]:
+        # Values rarely have surrounding whitespace, strip only when they do.
+        s = s.strip()
+        if s[:1] != brackets[0] or s[-1:] != brackets[1]:
+            raise ValueError(s)
+    body = s[1:-1]
+    if _YAML_SPECIAL_CHARS.search(body):
+        raise ValueError(s)
+    if not body.strip():
+        return []
+    return [item.strip() for item in body.split(',')]
+
+
+def _parse_scalar(s: str, typ: Type) -> Any:
+    """
+    Convert a plain scalar split by `_split_flow` into `typ`.
+
+    Raise `ValueError` unless the result is guaranteed to be the same as
+    converting the YAML-parsed value, e.g. `010` is an octal number in YAML.
+    """
+    if typ is str:
+        if s.isidentifier() and s not in _YAML_RESERVED_WORDS:
+            return s
+        raise ValueError(s)
+    digits = s.lstrip('+-')
+    if len(digits) > 1 and digits[0] == '0' and digits[1] != '.':
+        raise ValueError(s)
+    if typ is float and digits.replace('_', '').isdigit():
+        # YAML reads it as an int, so `-0` becomes `0.0`, not `-0.0`.
+        return float(int(s))
+    return typ(s)
+
+
+def _load_enum(s: str, typ: Type, lookup: Dict[str, Any]) -> Any:
+    """
+    Load enum value from the environment variable string, `MISSING` if no member matches.
+    """
+    member = lookup.get(s)
+    if member is None:
+        member = _find_enum_member(typ, s)
+    return MISSING if member is None else member
+
+
+def _find_enum_member(typ: Type, s: str) -> Any:
+    """
+    Find the enum member by converting the string into the value type of each member.
+    """
+    for value_type in _enum_value_types(cast(Hashable, typ)):
         try:
-            setattr(obj, f.name, typ(type(enum_item.value)(os.environ[name])))
-            return
-        except (KeyError, ValueError):
+            return typ(value_type(s))
+        except ValueError:
             continue
+    return None
 
 
-def _load_str(obj, f: Field, prefix: str, f_type: Optional[Type] = None) -> None:
+@functools.lru_cache(maxsize=None)
+def _enum_value_types(typ: Type) -> Tuple[Type, ...]:
     """
-    Override str values by environment variables.
+    Get the distinct types of enum member values in definition order.
     """
-    name = f'{prefix.upper()}{f.name.upper()}'
-    typ = f_type or f.type
-    try:
-        value = os.environ[name]
-        setattr(obj, f.name, _to_value(value, typ))
-    except KeyError:
-        pass
+    return tuple(dict.fromkeys(type(enum_item.value) for enum_item in typ))
+
+
+def _enum_lookup(typ: Type) -> Dict[str, Any]:
+    """
+    Build the map from string representation of values to enum members.
+    """
+    lookup = {}
+    for enum_item in typ:
+        s = str(enum_item.value)
+        if s not in lookup:
+            # Resolve in the same way as `_find_enum_member` in case the string
+            # converts into the value of another member first. Values such as `None`
+            # can't be converted from a string, which is left to fail when loading.
+            try:
+                member = _find_enum_member(typ, s)
+            except TypeError:
+                continue
+            if member is not None:
+                lookup[s] = member
+    return lookup
+
+
+def _load_str(s: str, typ: Type, args: Tuple) -> Any:
+    """
+    Load str value from the environment variable string.
+    """
+    return _to_value(s, typ)
 
 
-def _load_other(obj, f: Field, prefix: str, f_type: Optional[Type] = None) -> None:
+def _load_primitive(s: str, typ: Type, args: Tuple) -> Any:
     """
-    Override values by environment variables.
+    Load int, float or bool value from the environment variable string. Plain
+    numbers and booleans are converted without YAML.
     """
-    name = f'{prefix.upper()}{f.name.upper()}'
-    typ = f_type or f.type
     try:
-        yml = yaml.safe_load(os.environ[name])
-        setattr(obj, f.name, _to_value(yml, typ))
-    except KeyError:
-        pass
+        if typ is bool:
+            return _BOOL_VALUES[s]
+        return _parse_scalar(s.strip(), typ)
+    except (KeyError, ValueError):
+        return _load_other(s, typ, args)
+
+
+_BOOL_VALUES = {
+    **dict.fromkeys(('yes', 'Yes', 'YES', 'true', 'True', 'TRUE', 'on', 'On', 'ON', '1'), True),
+    **dict.fromkeys(('no', 'No', 'NO', 'false', 'False', 'FALSE', 'off', 'Off', 'OFF', '0'), False),
+}
+""" Strings YAML reads as bool, or as int 1 and 0. """
+
+
+def _load_other(s: str, typ: Type, args: Tuple) -> Any:
+    """
+    Load value from the environment variable string.
+    """
+    yml = _parse_value(s)
+    return _to_value(yml, typ)
+
+
+_LOADERS: Tuple[Callable[..., Any], ...] = (_load_list, _load_tuple, _load_dict, _load_enum,
+                                            _load_str, _load_primitive, _load_other)
+""" Loader functions indexed by field type category. """
 
 
 def is_enum(typ: Type) -> bool:
@@ -309,8 +671,9 @@ def is_list(typ: Type) -> bool:
     """
     Test if the type is `typing.List`.
     """
+    origin = cast(Type, getattr(typ, '__origin__', None))
     try:
-        return issubclass(get_origin(typ), list)
+        return issubclass(origin, list)
     except TypeError:
         return isinstance(typ, list)
 
@@ -319,8 +682,9 @@ def is_tuple(typ: Type) -> bool:
     """
     Test if the type is `typing.Tuple`.
     """
+    origin = cast(Type, getattr(typ, '__origin__', None))
     try:
-        return issubclass(get_origin(typ), tuple)
+        return issubclass(origin, tuple)
     except TypeError:
         return isinstance(typ, tuple)
 
@@ -329,8 +693,9 @@ def is_dict(typ: Type) -> bool:
     """
     Test if the type is `typing.Dict`.
     """
+    origin = cast(Type, getattr(typ, '__origin__', None))
     try:
-        return issubclass(get_origin(typ), dict)
+        return issubclass(origin, dict)
     except TypeError:
         return isinstance(typ, dict)
 
@@ -392,4 +757,12 @@ def load_env(inst, prefix: str = None) -> None:
     >>> foo.v
     100
     """
-    inst.__envclasses_load_env__(prefix)
+    env: Mapping[str, str] = os.environ
+    if getattr(inst, ENVCLASS_NUM_LOOKUPS_NAME, 0) > len(env):
+        # `os.environ` raises and catches `KeyError` internally for every variable
+        # not set, so with this many lookups a plain dict copy is cheaper. Only the
+        # variables with the prefix can match, which also lets nested envclasses
+        # without any variable set be skipped quickly.
+        env_prefix = _normalize_prefix(prefix)
+        env = {k: v for k, v in env.items() if k.startswith(env_prefix)}
+    inst.__envclasses_load_env__(prefix, env)
@@ -3,7 +3,10 @@ import os
 from pathlib import Path
 from typing import List, Tuple, Dict, Optional
 
-from dataclasses import dataclass, fields, field
+import pytest
+import yaml
+from dataclasses import dataclass, fields, field, make_dataclass
+import envclasses
 from envclasses import envclass, load_env, is_enum, is_dict, InvalidNumberOfElement
 
 basedir = Path(__file__).parent
@@ -60,6 +63,37 @@ def test_envclass_enum():
     assert h.s == SEnum.s2
     assert h.i == IEnum.i2
 
+    class FEnum(enum.Enum):
+        f1: float = 1.0
+        f2: float = 2.0
+
+    @envclass
+    @dataclass
+    class Fuga:
+        f: FEnum = FEnum.f1
+
+    f = Fuga()
+    os.environ['ENV_F'] = '2'
+    load_env(f)
+    assert f.f == FEnum.f2
+    os.environ['ENV_F'] = 'invalid'
+    load_env(f)
+    assert f.f == FEnum.f2
+
+    class NEnum(enum.Enum):
+        n1 = None
+        n2 = 'hoge'
+
+    @envclass
+    @dataclass
+    class Piyo:
+        n: NEnum = NEnum.n2
+
+    p = Piyo()
+    os.environ.pop('PIYO_N', None)
+    load_env(p, prefix='piyo')
+    assert p.n == NEnum.n2
+
 
 def test_envclass_list():
     @envclass
@@ -163,6 +197,23 @@ def test_envclass_nested():
     assert h.fuga.s == 'fugafuga'
 
 
+def test_envclass_nested_trailing_underscore():
+    @envclass
+    @dataclass
+    class Fuga:
+        i: int
+
+    @envclass
+    @dataclass
+    class Hoge:
+        in_: Fuga
+
+    h = Hoge(in_=Fuga(i=100))
+    os.environ['FOO_IN_I'] = '200'
+    load_env(h, prefix='foo')
+    assert h.in_.i == 200
+
+
 def test_envclass_pathlib():
     @envclass
     @dataclass
@@ -218,6 +269,80 @@ def test_load_env_with_underscore_prefix():
     assert h.i == 40
 
 
+def test_load_env_with_alternating_prefix():
+    @envclass
+    @dataclass
+    class Fuga:
+        i: int
+
+    @envclass
+    @dataclass
+    class Hoge:
+        i: int
+        fuga: Fuga
+
+    h = Hoge(i=10, fuga=Fuga(i=100))
+    os.environ['FOO_I'] = '20'
+    os.environ['FOO_FUGA_I'] = '200'
+    os.environ['ENV_I'] = '30'
+    os.environ['ENV_FUGA_I'] = '300'
+    for _ in range(2):
+        load_env(h, prefix='foo')
+        assert h.i == 20
+        assert h.fuga.i == 200
+        load_env(h)
+        assert h.i == 30
+        assert h.fuga.i == 300
+
+
+def test_load_env_with_changed_default_prefix():
+    @envclass
+    @dataclass
+    class Hoge:
+        i: int
+
+    h = Hoge(i=10)
+    os.environ['ENV_I'] = '20'
+    os.environ['BAR_I'] = '30'
+    load_env(h)
+    assert h.i == 20
+    try:
+        envclasses.ENVCLASS_PREFIX = 'bar'
+        load_env(h)
+        assert h.i == 30
+    finally:
+        envclasses.ENVCLASS_PREFIX = 'env'
+
+
+def test_load_env_with_many_fields():
+    os.environ['ENV_F0'] = '1'
+    os.environ['ENV_FUGA_F1'] = '2'
+    names = [f'f{i}' for i in range(len(os.environ) + 1)]
+    Fuga = envclass(make_dataclass('Fuga', [(n, int, 0) for n in names]))
+    Hoge = envclass(make_dataclass('Hoge', [('f0', int, 0), ('fuga', Fuga, None)]))
+
+    h = Hoge()
+    load_env(h)
+    assert h.f0 == 1
+    assert h.fuga.f1 == 2
+
+    h = Hoge()
+    load_env(h, prefix='hoge')
+    assert h.f0 == 0
+    assert h.fuga == Fuga()
+
+
+def test_load_env_with_many_fields_nested():
+    names = [f'f{i}' for i in range(len(os.environ) + 1)]
+    Piyo = envclass(make_dataclass('Piyo', [('i', int, 0)]))
+    Fuga = envclass(make_dataclass('Fuga', [(n, int, 0) for n in names] + [('piyo', Piyo, None)]))
+    Hoge = envclass(make_dataclass('Hoge', [('fuga', Fuga, None)]))
+
+    h = Hoge()
+    load_env(h, prefix='hoge')
+    assert h.fuga.piyo == Piyo()
+
+
 def test_str():
     @envclass
     @dataclass
@@ -307,3 +432,123 @@ def test_optional():
     assert h.p == Path("/dev/null")
     assert h.fuga.i == 200
     assert h.fuga.s == "fugafuga"
+
+
+def test_envclass_no_fields():
+    @envclass
+    @dataclass
+    class Hoge:
+        pass
+
+    h = Hoge()
+    load_env(h)
+    assert h == Hoge()
+
+
+def test_envclass_list_dict_yaml_compat():
+    @envclass
+    @dataclass
+    class Hoge:
+        lst_int: List[int] = field(default_factory=list)
+        lst_float: List[float] = field(default_factory=list)
+        lst_str: List[str] = field(default_factory=list)
+        dct: Dict[str, int] = field(default_factory=dict)
+        lst_json: List[str] = field(default_factory=list)
+        dct_nested_int: Dict[str, int] = field(default_factory=dict)
+        dct_nested_str: Dict[str, str] = field(default_factory=dict)
+
+    h = Hoge()
+    os.environ['ENV_LST_INT'] = '[010, 0x10, 1_000, 1:30]'
+    os.environ['ENV_LST_FLOAT'] = '[-0, 1e5, .5]'
+    os.environ['ENV_LST_STR'] = '[hoge, true, null, 010, "a, b"]'
+    os.environ['ENV_DCT'] = '{a: 010, b: 0x10}'
+    os.environ['ENV_LST_JSON'] = '["a", 1.5, 1e5, NaN, true]'
+    os.environ['ENV_DCT_NESTED_INT'] = '{a: [1], b: 2}'
+    os.environ['ENV_DCT_NESTED_STR'] = '{a: [1], b: {c: 2}}'
+    load_env(h)
+    assert h.lst_int == [8, 16, 1000, 90]
+    assert h.lst_float == [0.0, 1e5, 0.5]
+    assert str(h.lst_float[0]) == '0.0'
+    assert h.lst_str == ['hoge', 'True', 'None', '8', 'a, b']
+    assert h.dct == {'a': 8, 'b': 16}
+    assert h.lst_json == ['a', '1.5', '1e5', 'NaN', 'True']
+    assert h.dct_nested_int == {'a': [1], 'b': 2}
+    assert h.dct_nested_str == {'a': [1], 'b': {'c': 2}}
+
+
+def test_envclass_dict_libyaml():
+    @envclass
+    @dataclass
+    class Hoge:
+        dct: Dict[int, List[int]] = field(default_factory=dict)
+
+    h = Hoge()
+    os.environ['ENV_DCT'] = '{-1:[1]}'
+    if envclasses._YAML_LOADER is yaml.SafeLoader:
+        load_env(h)
+        assert h.dct == {-1: [1]}
+    else:
+        # libyaml requires a space between `:` and a flow collection value.
+        with pytest.raises(yaml.YAMLError):
+            load_env(h)
+    os.environ['ENV_DCT'] = '{-1: [1]}'
+    load_env(h)
+    assert h.dct == {-1: [1]}
+
+
+def test_envclass_slots():
+    @envclass
+    @dataclass
+    class Hoge:
+        __slots__ = ('i', 'lst')
+        i: int
+        lst: List[int]
+
+    h = Hoge(i=10, lst=[])
+    os.environ['ENV_I'] = '20'
+    os.environ['ENV_LST'] = '[1, 2]'
+    load_env(h)
+    assert h.i == 20
+    assert h.lst == [1, 2]
+
+
+def test_envclass_custom_setattr():
+    @envclass
+    @dataclass
+    class Hoge:
+        i: int
+        s: str
+
+        def __setattr__(self, name, value):
+            super().__setattr__(name, value * 2)
+
+    h = Hoge(i=10, s='a')
+    os.environ['ENV_I'] = '20'
+    os.environ['ENV_S'] = 'b'
+    load_env(h)
+    assert h.i == 40
+    assert h.s == 'bb'
+
+
+def test_envclass_subclass_custom_setattr():
+    @envclass
+    @dataclass
+    class Hoge:
+        i: int
+        s: str
+
+    class Fuga(Hoge):
+        def __setattr__(self, name, value):
+            super().__setattr__(name, value * 2)
+
+    f = Fuga(i=10, s='a')
+    os.environ['ENV_I'] = '20'
+    os.environ['ENV_S'] = 'b'
+    load_env(f)
+    assert f.i == 40
+    assert f.s == 'bb'
+
+    h = Hoge(i=10, s='a')
+    load_env(h)
+    assert h.i == 20
+    assert h.s == 'b'